@@ -0,0 +1,95 @@
+import os  # We import os to build file paths and compare file modification times
+import inspect  # We import inspect to find the file in which a function was written
+import tempfile  # We import tempfile to write the cache files under a temporary name first
+import numpy as np  # We import numpy for its NaN value
+import pandas as pd  # We import pandas for data manipulation
+import pyarrow as pa  # We import pyarrow to write and memory-map Arrow IPC files
+
+# ============================================================
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__)) # the folder of this file i.e., project-repo
+
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", ".cache")
+# We call CACHE_DIR the folder where the Arrow copies of our CSV files are stored i.e., project-repo/data/.cache
+# We build it from the location of this file so that it is the same folder whatever directory the scripts are run from
+
+
+def cached_read(path):
+    # We define a function that reads a CSV file into a dataframe but only parses the CSV text the first time
+    # On the first run we parse the CSV with pandas and save a binary Arrow copy of it in data/.cache/
+    # On the following runs we memory-map that Arrow file instead, so the slow CSV tokenizing step is skipped entirely
+
+    cache_path = os.path.join(CACHE_DIR, f"{_cache_name(path)}.arrow")
+    # e.g., data/processed/fbref_cleaned.csv → data/.cache/data__processed__fbref_cleaned.arrow
+
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) > os.path.getmtime(path):
+        # The cache is only valid if it was written after the last modification of the CSV file
+        # Otherwise the CSV has been regenerated since (e.g., by match_transfers.py) and we must parse it again
+        return _read_arrow(cache_path)
+
+    df = pd.read_csv(path)
+    # We still parse the CSV with pandas so that the dataframe is the same as with a plain pd.read_csv() (see _read_arrow() for the missing values)
+
+    _write_arrow(df, cache_path)
+    return df
+
+
+def cached_transform(path, transform):
+    # We define a function that returns transform(cached_read(path)) but saves the transformed dataframe in data/.cache/ as well
+    # e.g., the standardized fbref df of match_transfers.py, so the following runs skip the cleaning of the names, leagues and seasons too
+
+    cache_path = os.path.join(CACHE_DIR, f"{_cache_name(path)}_{transform.__name__}.arrow")
+    # e.g., data/processed/fbref_cleaned.csv and standardize_fbref() → data/.cache/data__processed__fbref_cleaned_standardize_fbref.arrow
+
+    sources = [path, inspect.getfile(transform)]
+    # The cache must be newer than the CSV file but also than the script where transform() is written
+    # Otherwise a change to the cleaning code would be ignored until the CSV file changes
+    if os.path.exists(cache_path) and all(os.path.getmtime(cache_path) > os.path.getmtime(source) for source in sources):
+        return _read_arrow(cache_path)
+
+    df = transform(cached_read(path))
+    _write_arrow(df, cache_path)
+    return df
+
+
+def _cache_name(path):
+    # We define a function that gives the name of the cache file of a CSV file from its path relative to the project root
+    # Using only the filename would make two CSV files with the same name in different folders share (and overwrite) the same cache file
+    relative_path = os.path.relpath(os.path.abspath(path), PROJECT_ROOT)
+    return os.path.splitext(relative_path)[0].replace(os.sep, "__")
+    # e.g., data/processed/fbref_cleaned.csv → data__processed__fbref_cleaned
+
+
+def _read_arrow(cache_path):
+    # We define a function that loads a dataframe from an Arrow IPC file of the cache
+    source = pa.memory_map(cache_path, "r")
+    # memory_map() lets the operating system load the file lazily instead of copying it into memory up front
+    df = pa.ipc.open_file(source).read_all().to_pandas()
+    # read_all() gives us an Arrow table pointing at the mapped file and to_pandas() turns it into a regular dataframe
+
+    text_cols = df.select_dtypes("object").columns
+    df[text_cols] = df[text_cols].where(df[text_cols].notna(), np.nan)
+    # to_pandas() gives back the missing values of text columns as None while pd.read_csv() gives NaN, so we put NaN back
+    return df
+
+
+def _write_arrow(df, cache_path):
+    # We define a function that saves a dataframe as an Arrow IPC file of the cache
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    table = pa.Table.from_pandas(df)
+    # from_pandas() keeps the row indices in the table metadata so that to_pandas() gives them back e.g., after rows were filtered out
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".arrow.tmp")
+    os.close(fd)
+    # We first write to a temporary file in the same folder, mkstemp() gives it a unique name so two runs never write to the same file
+    try:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        # We write the table in the Arrow IPC file format which is the format that can be memory-mapped on the next run
+        os.replace(tmp_path, cache_path)
+        # os.replace() only puts the file in place once it is complete, in one step
+        # Otherwise a run interrupted in the middle of the write would leave a truncated cache file that is newer than the CSV and every following run would crash on it
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+        # If the write fails (or is interrupted with Ctrl+C) we delete the temporary file and let the error through
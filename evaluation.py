@@ -4,7 +4,7 @@ from sklearn.metrics import r2_score
 
 def evaluate_model(model, X_test, y_test):
     # We create an evaluate_Model that will enable us to evaluate a regression model using the R².
-    # The first input is the model this can be 1 out the 3 ML Models we used i.e., LinearRegression(), RandomForestRegressor() and GradientBoostingRegressor()
+    # The first input is the model this can be 1 out the 3 ML Models we used i.e., LinearRegression(), RandomForestRegressor() and HistGradientBoostingRegressor()
     # The second input contains the test features used by the model to make predictions and the third input contains the true after_GA_per_90 values for the test set.    
     # This will return the R² score i.e., how well the model explains the variation in after_GA_per_90
    
@@ -13,10 +13,12 @@ from evaluation import evaluate_model, print_evaluation_results
 
 # ============================================================
 
-df = pd.read_csv("data/processed/transfers_matched_complete.csv")
-# We are now loading the final_dataset csv file i.e., the final merged dataset containing all matched players with their respective performance and transfer statistics
+df = pd.read_parquet("data/processed/transfers_matched_complete.parquet")
+# We are now loading the final_dataset parquet file i.e., the final merged dataset containing all matched players with their respective performance and transfer statistics
 # We load this merged dataset into a dataframe df
-# You can replace the file path with your own CSV file as long as it has the target variable i.e., after_GA_per_90 and a set of features such as minutes_played, goals, assists, xG, xA ...
+# Parquet stores the columns in binary form so pandas doesn't have to parse any text, which makes it much faster to load than a csv file
+# You can replace the file path with your own file as long as it has the target variable i.e., after_GA_per_90 and a set of features such as minutes_played, goals, assists, xG, xA ...
+# For a CSV file simply use pd.read_csv() instead (or cached_read() from data_cache.py to reuse an Arrow copy of it on later runs)
 
 df = df.loc[:, ~df.columns.str.contains("Unnamed")]
 # We remove useless "Unnamed" columns created by FBref exports
@@ -105,7 +107,7 @@ rf_model, rf_train_score, rf_test_score, rf_y_pred_test = train_random_forest(X_
 print("Training Gradient Boosting")
 gb_model, gb_train_score, gb_test_score, gb_y_pred_test = train_gradient_boosting(X_train, y_train, X_test, y_test)
 # With the variables we have just obtained thanks to the train_test_split function, we can now input them into the train_gradient_boosting function that we imported from our modeling.py file.
-# This returns the ML model that was used so here GradientBoostingRegressor(), the train_score i.e., the R² score for the training dataset,
+# This returns the ML model that was used so here HistGradientBoostingRegressor(), the train_score i.e., the R² score for the training dataset,
 # test_score i.e., the R² score for the testing dataset and y_pred_test, the predicted after_G+A for each player
 
 # ============================================================
@@ -1,14 +1,37 @@
 import pandas as pd  #  We import the pandas library for data manipulation
+import numpy as np  # We import numpy to convert the inputs of the models into a single number type
 from sklearn.linear_model import LinearRegression   # We import our first model from sklearn's linear_model module
 from sklearn.ensemble import RandomForestRegressor  # We import our second model from sklearn's ensemble module
-from sklearn.ensemble import GradientBoostingRegressor  # We import our second model from sklearn's ensemble module
+from sklearn.ensemble import HistGradientBoostingRegressor  # We import our third model from sklearn's ensemble module
 from sklearn.metrics import r2_score  # We import the r2 in order to be able to the evaluate ML performance from the metrics module
+import os  # We import os to know how many CPU cores the computer has
+from functools import partial  # We import partial in order to fix the number of cores given to the random forest in train_all_models
+from joblib import Parallel, delayed  # We import joblib's Parallel and delayed in order to train the three models at the same time
+from threadpoolctl import threadpool_limits  # We import threadpool_limits (installed with scikit-learn) to cap the number of threads the models' native libraries start
+
+# ============================================================
+
+def _prep(X, dtype=np.float32):
+    # We define a helper that converts the input features of a model into a single number type once, before fit() and predict()
+    # Our df mixes float, integer and boolean columns, so scikit-learn would otherwise convert it to a number array again in each fit() and predict() call
+    # After one astype() every column has the same dtype and scikit-learn can use the values of the df as they are
+    # The random forest compares the features in single precision (float32), which is why it is the default, while the linear regression and the gradient boosting ask for float64
+    if isinstance(X, pd.DataFrame):
+        return X.astype(dtype, copy=False)
+        # We keep dfs as dfs so that the model remembers the names of the features e.g., for evaluate_model() which gives it the original X_test df
+    return np.asarray(X, dtype=dtype) # e.g., if X is already a numpy array
+
 
 # ============================================================
 
 def train_linear_regression(X_train, y_train, X_test, y_test):
     # We define a function that trains the linear regression on the training data.
 
+    X_train = _prep(X_train, np.float64)
+    X_test = _prep(X_test, np.float64)
+    # Once every column is float64, the single block of the df is stored column by column, so the array scikit-learn gets is already Fortran-ordered (column-major)
+    # This is the layout the least-squares solver (LAPACK) works with, so it doesn't need to make its own reordered copy
+
     model = LinearRegression()  
     # model will be the name of the object of the LinearRegression class
     # This object will allow us to make the best linear equation between x and y .
@@ -38,8 +61,14 @@ def train_linear_regression(X_train, y_train, X_test, y_test):
 # ============================================================
 
 
-def train_random_forest(X_train, y_train, X_test, y_test):
+def train_random_forest(X_train, y_train, X_test, y_test, n_jobs=-1):
     # We define a  function that trains the random forest Model on the training data.
+    # n_jobs is the number of CPU cores used to build the trees, -1 means all of them
+
+    X_train = _prep(X_train)
+    X_test = _prep(X_test)
+    # We convert the inputs to float32, the type the trees compare the features in, once so that fit() and predict() reuse the same converted df
+    # Otherwise scikit-learn would convert our mixed df to float32 again in each of these calls
 
     model = RandomForestRegressor(
         n_estimators=300,       # We select 300 trees here because it gives excellent performance with low risk of overfitting
@@ -47,7 +76,7 @@ def train_random_forest(X_train, y_train, X_test, y_test):
                                 # We can't be more precise in the prediction based on the information we have
         random_state=50,        # 50 is an arbitrary random seed and it ensures the exact same random choices are made every time
                                 # So this will always follow the same sequence of random choices
-        n_jobs=-1               # This just ensures the model runs as fast as possible
+        n_jobs=n_jobs           # By default (-1) this just ensures the model runs as fast as possible
     )
     # model will be the name of the object of the RandomForestRegressor class
     # The principle of the Random Forest model is to generate many trees where each tree predicts the target variable i.e., the player's after_GA_per_90 here.
@@ -80,17 +109,24 @@ def train_random_forest(X_train, y_train, X_test, y_test):
 def train_gradient_boosting(X_train, y_train, X_test, y_test):
     # We define a train function for the gradient boosting ML Model
 
+    X_train = _prep(X_train, np.float64)
+    X_test = _prep(X_test, np.float64)
+    # Unlike the random forest, HistGradientBoostingRegressor works on float64 inputs (it sorts them into its bins itself) so we convert them to float64 once
+    # float32 would only round the values before scikit-learn converts them back to float64 inside fit()
 
-    model = GradientBoostingRegressor(
-        n_estimators=300,        # We select 300 sequential tree corrections, which improves accuracy while keeping overfitting under control as each tree is shallow (low max_depth)
+
+    model = HistGradientBoostingRegressor(
+        max_iter=300,            # We select 300 sequential tree corrections, which improves accuracy while keeping overfitting under control as each tree is shallow (low max_depth)
         learning_rate=0.05,      # This controls how much each new tree is allowed to correct the errors of the previous ones.
                                  # We use 0.05 here because it's small which makes the model learn more slowly and carefully ultimately reducing overfitting
         max_depth=3,             # This controls how complex each tree is. 3 is small and ideal as many small trees added together can learn relationships without overfitting
         random_state=70          # 70 is an arbitrary random seed and it ensures the exact same random choices are made every time
                                  # So this will always follow the same sequence of random choices
     )
-    # model will be the name of the object of the GradientBoostingRegressor class
+    # model will be the name of the object of the HistGradientBoostingRegressor class
     # Gradient Boosting builds small trees one after another and each tree corrects the errors of the previous one.
+    # The "Hist" version first sorts the values of each feature into at most 255 bins, so each tree only has to look at the bins instead of every single value to find its splits
+    # This makes it much faster than the classic GradientBoostingRegressor and it also uses all CPU cores
     # This allows the model to become very accurate at predicting the target variable i.e., after_GA_per_90
 
 
@@ -111,54 +147,61 @@ def train_gradient_boosting(X_train, y_train, X_test, y_test):
     # # The r2_score function compares the real values of after_GA_per_90 from the dataset with the predicted values produced from the model as inputs
 
     return model, train_score, test_score, y_pred_test
-    # We return the ML model that was used so here GradientBoostingRegression(), the train_score i.e., the R² score for the training dataset
+    # We return the ML model that was used so here HistGradientBoostingRegressor(), the train_score i.e., the R² score for the training dataset
     # test_score i.e., the R² score for the testing dataset and y_pred_test, the predicted after_GA_per_90 for each player
 
 
+# ============================================================
+
+def _train_limited(train, n_threads, X_train, y_train, X_test, y_test):
+    # We define a helper that runs one train function with at most n_threads OpenMP threads e.g., for the gradient boosting
+    # The limit is set inside the thread that trains the model because OpenMP keeps its thread count per thread
+    # We only limit OpenMP here: the BLAS thread count is shared by the whole program so it is limited once in train_all_models
+    # Otherwise the 3 threads would each save and restore it at different times and the last one to finish could leave it capped after train_all_models
+    with threadpool_limits(limits=n_threads, user_api="openmp"):
+        return train(X_train, y_train, X_test, y_test)
+
+
 # ============================================================
 
 def train_all_models(X_train, y_train, X_test, y_test):
     # This function trains all 3 models i.e., Linear Regression, Random Forest and Gradient Boosting on the training data.
 
+    n_threads = max(1, (os.cpu_count() or 1) // 3)
+    # We split the CPU cores between the 3 models trained at the same time e.g., 4 cores each on a 12 core computer and at least 1
+    # Otherwise the random forest (n_jobs=-1) and the gradient boosting (OpenMP) would each start one thread per core on top of our 3 threads
+    # and the models would fight over the same cores instead of running side by side
+
+    trainers = {
+        "Linear Regression": train_linear_regression,
+        "Random Forest": partial(train_random_forest, n_jobs=n_threads),
+        "Gradient Boosting": train_gradient_boosting
+    } # The key is the name of the model and the value is the function that trains it
+      # partial() gives us train_random_forest with n_jobs already set to its share of the cores
+
+    with threadpool_limits(limits=n_threads, user_api="blas"):
+        outputs = Parallel(n_jobs=len(trainers), prefer="threads")(
+            delayed(_train_limited)(train, n_threads, X_train, y_train, X_test, y_test) for train in trainers.values()
+        )
+    # threadpool_limits() caps the BLAS threads e.g., for the linear regression during the whole training and puts back the previous value at the end
+    # The three models don't depend on each other so we train them at the same time instead of one after the other
+    # delayed() wraps each call so that Parallel() can send it to one of the 3 threads, the total time is then roughly the time of the slowest model
+    # prefer="threads" because scikit-learn releases the GIL while it builds the trees and solves the linear regression so threads really run in parallel
+    # and, unlike processes, threads don't have to copy X_train and y_train
+    # Parallel() gives the outputs back in the same order as the trainers, whichever model finishes first
+
     results = {}
     # We create a dictionary named results because for each model, we want a single object that contains everything we need from the model
     # i.e., the trained model itself(coefficients, internal settings ...), training R² score, testing R² score and the predictions on the test set
 
-    lr_model, lr_train, lr_test, lr_pred = train_linear_regression(
-        X_train, y_train, X_test, y_test
-    ) # These are the names given to the outputs of the train_linear_regression function
-
-    results["Linear Regression"] = {
-        "model": lr_model,
-        "train_r2": lr_train,
-        "test_r2": lr_test,
-        "predictions": lr_pred
-    } # We then stock them in the dictionary notice that there is the main dictionnary where the key is the name of the model and the value is the output of the executed function above
-      # We then have a secondary dictionary where each key is for the respective 4 outputs of the function above
-
-    rf_model, rf_train, rf_test, rf_pred = train_random_forest(
-        X_train, y_train, X_test, y_test
-    ) # These are the names given to the outputs of the train_random_forest function
-
-    results["Random Forest"] = {
-        "model": rf_model,
-        "train_r2": rf_train,
-        "test_r2": rf_test,
-        "predictions": rf_pred
-    } # We then stock them in the dictionary notice that there is the main dictionnary where the key is the name of the model and the value is the output of the executed function above
-      # We then have a secondary dictionary where each key is for the respective 4 outputs of the function above
-
-    gb_model, gb_train, gb_test, gb_pred = train_gradient_boosting(
-        X_train, y_train, X_test, y_test
-    ) # These are the names given to the outputs of the train_gradient_boosting function
-
-    results["Gradient Boosting"] = {
-        "model": gb_model,
-        "train_r2": gb_train,
-        "test_r2": gb_test,
-        "predictions": gb_pred
-    } # We then stock them in the dictionary notice that there is the main dictionnary where the key is the name of the model and the value is the output of the executed function above
-      # We then have a secondary dictionary where each key is for the respective 4 outputs of the function above
+    for name, (model, train_score, test_score, predictions) in zip(trainers, outputs):
+        results[name] = {
+            "model": model,
+            "train_r2": train_score,
+            "test_r2": test_score,
+            "predictions": predictions
+        } # We then stock them in the dictionary notice that there is the main dictionnary where the key is the name of the model and the value is the output of its train function
+          # We then have a secondary dictionary where each key is for the respective 4 outputs of the function
 
     return results
     # We then return the entire dictionary
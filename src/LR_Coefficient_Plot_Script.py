@@ -17,9 +17,9 @@ sys.path.append(PROJECT_ROOT)
 # So this allows imports such as "from modeling import train_linear_regression"
 
 
-DATA_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "transfers_matched_complete.csv")
-# We call DATA_PATH the full path to the CSV file where we have all our merged data
-# we get project-repo/data/processed/transfers_matched_complete.csv
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "transfers_matched_complete.parquet")
+# We call DATA_PATH the full path to the parquet file where we have all our merged data
+# we get project-repo/data/processed/transfers_matched_complete.parquet
 
 RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
 # We call RESULTS_DIR the path to the results folder i.e., project-repo/results
@@ -39,8 +39,8 @@ from modeling import train_linear_regression
 # ============================================================
 
 
-df = pd.read_csv(DATA_PATH)
-# We read the csv file thanks to the path created earlier
+df = pd.read_parquet(DATA_PATH)
+# We read the parquet file thanks to the path created earlier
 
 df = df.loc[:, ~df.columns.str.contains("Unnamed")]
 # We now know that when we export csv files, these may create useless columns like "Unnamed ..."
@@ -16,9 +16,9 @@ sys.path.append(PROJECT_ROOT)
 # This will allow the script inside the src/ folder—to import modules located in the project root like modeling.py and other folders.
 # So this allows imports such as "from modeling import train_random_forest"
 
-DATA_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "transfers_matched_complete.csv")
-# We call DATA_PATH the full path to the CSV file where we have all our merged data
-# we get project-repo/data/processed/transfers_matched_complete.csv
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "transfers_matched_complete.parquet")
+# We call DATA_PATH the full path to the parquet file where we have all our merged data
+# we get project-repo/data/processed/transfers_matched_complete.parquet
 
 RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
 # We call RESULTS_DIR the path to the results folder i.e., project-repo/results
@@ -42,8 +42,8 @@ from modeling import (
 
 # ============================================================
 
-df = pd.read_csv(DATA_PATH)
-# We read the csv file thanks to the path created earlier
+df = pd.read_parquet(DATA_PATH)
+# We read the parquet file thanks to the path created earlier
 
 df = df.loc[:, ~df.columns.str.contains("Unnamed")]
 # We now know that when we export csv files, these may create useless columns like "Unnamed ..."
@@ -106,7 +106,7 @@ gb_model, gb_train_r2, gb_test_r2, gb_pred = train_gradient_boosting(
 )
 # We now use our train_gradient_boosting() that we imported from the modeling.py file.
 # The inputs are the recently obtained training inputs, testing inputs, target values for each row of X_train and the target values for each row of X_test
-# We return the ML model that was used so here GradientBoostingRegression(), the train_score i.e., the R² score for the training dataset
+# We return the ML model that was used so here HistGradientBoostingRegressor(), the train_score i.e., the R² score for the training dataset
 # test_score i.e., the R² score for the testing dataset and y_pred_test, the predicted after_GA_per_90 for each player
 
 # ============================================================
@@ -1,5 +1,8 @@
 import pandas as pd  # import pandas for data manipulation
 import numpy as np  # import numpy for numerical operations e.g. NaN handling
+import re  # import re to compile our regex pattern once at the top of the script
+
+WHITESPACE_PATTERN = re.compile(r'\s+')  # r'\s+' is a regex pattern that matches any sequence of whitespace like spaces
 
 # ============================================
 
@@ -170,8 +173,8 @@ df_clean['Player'] = df_clean['Player'].str.strip()
 
 # Remove any special characters that might cause matching issues
 # But keep accents (é, ñ, etc.) as they're part of names
-df_clean['Player'] = df_clean['Player'].str.replace(r'\s+', ' ', regex=True)
-# r'\s+' is a regex pattern that matches any sequence of whitespace like spaces 
+df_clean['Player'] = df_clean['Player'].str.replace(WHITESPACE_PATTERN, ' ', regex=True)
+# WHITESPACE_PATTERN is the r'\s+' regex compiled at the top of the script
 # regex =True tells pandas that we're using a regex pattern
 # so here we're replacing multiple spaces with a single space i.e., ' '
 
@@ -1,6 +1,7 @@
 import pandas as pd # pandas library for data manipulation
 import os  # os library for file path operations such as joining paths
 import glob # glob library for file pattern matching e.g., finding all CSV files in a directory
+from concurrent.futures import ThreadPoolExecutor # ThreadPoolExecutor to load several CSV files at the same time
 
 # ============================================
 
@@ -40,11 +41,9 @@ league_mapping = {
     'seriea': 'Serie-A'
 }
 
-# This list we will hold all the dataframes we load from each CSV file
-all_stats = []
-
-# Load each CSV file
-for file_path in sorted(fbref_files): # sorted() to process files in order
+def load_fbref_file(file_path):
+    """Load one FBref CSV file and tag its rows with the league and season taken from the filename
+    Returns the message to print for this file and the dataframe, or None if the file has to be skipped"""
     filename = os.path.basename(file_path)
     filename_no_ext = filename.replace('.csv', '') # we remove the .csv extension to extract league and season info
     
@@ -53,14 +52,13 @@ for file_path in sorted(fbref_files): # sorted() to process files in order
     parts = filename_no_ext.rsplit('_', 1) # .rsplit() splits a string into a list so we divide the name by the league and season 
     
     if len(parts) != 2: # if we end up with an unexpected format we skip it
-        print(f"  Skipping {filename} - unexpected format")
-        continue # continue skips to the next loop iteration
+        return f"  Skipping {filename} - unexpected format", None
     
     league_raw, season = parts  # league_raw is the name of the league in the given file
     league = league_mapping.get(league_raw.lower(), league_raw) # get() retrieves the value for a given key, here the key correspond the basename of the file
     # in return it gives us the value i.e., the basename written correctly
 
-    print(f"Loading {league} {season}...", end=" ")
+    message = f"Loading {league} {season}..."
     
     try: # we use a try-except statement in case there is a problem reading the csv file
         # We load the csv file into a pandas dataframe
@@ -68,8 +66,7 @@ for file_path in sorted(fbref_files): # sorted() to process files in order
         
         # If the the dataframe has no rows we skip it
         if len(df) == 0:
-            print(f"  Empty file!")
-            continue
+            return f"{message}   Empty file!", None
         
         if 'Player' in df.columns:
             df = df[df['Player'] != 'Player'] # We remove duplicate header rows (where Player column = 'Player') by keeping only the different ones
@@ -83,13 +80,25 @@ for file_path in sorted(fbref_files): # sorted() to process files in order
         df['season'] = str(season)
         df['league'] = str(league)
         
-        # Append to list
-        all_stats.append(df) # once it's all done, we can add our newly adjusted dataframe to the global list
-        
-        print(f"✓ ({len(df)} players)")
+        return f"{message} ✓ ({len(df)} players)", df
         
     except Exception as e: # in case we can't load the csv file
-        print(f"✗ Error: {e}")
+        return f"{message} ✗ Error: {e}", None
+
+# This list we will hold all the dataframes we load from each CSV file
+all_stats = []
+
+# Load the CSV files in parallel
+with ThreadPoolExecutor(max_workers=8) as executor:
+    loaded = list(executor.map(load_fbref_file, sorted(fbref_files))) # sorted() to process files in order
+# executor.map() sends the files to a pool of 8 threads so several files are read at the same time
+# pandas releases the GIL while its C parser reads a file so the threads really run in parallel
+# map() gives the results back in the same order as the files, so the combined data is exactly the same as when we loaded them one by one
+
+for message, df in loaded:
+    print(message) # we print the messages once all files are loaded so that the lines don't get mixed up between threads
+    if df is not None:
+        all_stats.append(df) # once it's all done, we can add our newly adjusted dataframe to the global list
 
 # ============================================
 
@@ -143,13 +152,16 @@ if all_stats:
     
     # Show breakdown by league
     print("\n Records by league:")
-    league_counts = fbref_stats['league'].value_counts().sort_index() # this line counts how many rows i.e., player records belong to each league
+    league_counts = fbref_stats['league'].value_counts(sort=False).reindex(unique_leagues) # this line counts how many rows i.e., player records belong to each league
+    # unique_leagues was already sorted above so reindex() puts the counts in alphabetical order without sorting them a second time with sort_index()
+    # It only contains the leagues actually present, including any league name that wasn't in league_mapping
     for league, count in league_counts.items(): # .items() lets you iterate over the (key, value) pairs of a Series:
         print(f"   {league}: {count} player-seasons")
     
     # Show breakdown by season
     print("\n Records by season:")
-    season_counts = fbref_stats['season'].value_counts().sort_index() # the same principle for each season here
+    season_counts = fbref_stats['season'].value_counts(sort=False).reindex(unique_seasons) # the same principle for each season here
+    # unique_seasons was already sorted above so we reuse it instead of sorting the seasons a second time
     for season, count in season_counts.items():
         print(f"   {season}: {count} player-seasons")
     
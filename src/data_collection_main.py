@@ -115,14 +115,14 @@ print("="*60)
 # Show top 20 by transfer fee as the user can find that interesting. These can be considered "outliers" in the dataset.
 top_transfers = transfers_filtered.nlargest(20, 'Transfer_Fee') # nlargest allows us to get the top 20 rows with the largest values in the 'Transfer_Fee' column.
 
-for i, (idx, transfer) in enumerate(top_transfers.iterrows(), 1): #iterrows() allows us to loop through each row in the dataframe.
+for i, transfer in enumerate(top_transfers.itertuples(index=False), 1): #itertuples() allows us to loop through each row in the dataframe.
     # enumerate() allows us to get a counter (i) over something we are looping through, starting from 1 here.
-    # For each row, we get the index (idx) and the row data itself (transfer).
-    print(f"\n{i}. {transfer['Player']} ({transfer['Age']} years old)") # For a given row, we print the player's name and age.
-    print(f"   Position: {transfer['Position']}")
-    print(f"   From: {transfer['Previous_Club']}")
-    print(f"   Transfer Fee: €{transfer['Transfer_Fee']:,.0f}")
-    print(f"   League: {transfer['league']}")
+    # For each row, we get the row data itself (transfer) as a lightweight named tuple, which is much faster than the Series that iterrows() would build for each row.
+    print(f"\n{i}. {transfer.Player} ({transfer.Age} years old)") # For a given row, we print the player's name and age.
+    print(f"   Position: {transfer.Position}")
+    print(f"   From: {transfer.Previous_Club}")
+    print(f"   Transfer Fee: €{transfer.Transfer_Fee:,.0f}")
+    print(f"   League: {transfer.league}")
 # We subsequently print the position, previous club, transfer fee, and league for each of these transfers.
 
 
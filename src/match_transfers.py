@@ -1,39 +1,68 @@
 import pandas as pd # we import pandas library for data manipulation
 import numpy as np # we import numpy for fumerical operations
-from fuzzywuzzy import fuzz # This imports fuzzy string matching functions to calculate similarity between strings.
-from fuzzywuzzy import process # This imports the higher-level functions that find the best match from a list of strings
+from rapidfuzz import fuzz # This imports fuzzy string matching functions to calculate similarity between strings. RapidFuzz has the same API as fuzzywuzzy but is written in C++
+from rapidfuzz import process # This imports the higher-level functions that find the best match from a list of strings
+from rapidfuzz import utils # This imports default_process, the same lowercase/strip cleaning that fuzzywuzzy applied automatically
 from glob import glob # This is a tool to find files matching a certain path
+import os # we import os to build the path to the project root
+import sys # we import sys to be able to import modules located in the project root
+import re # we import re to compile our regex pattern once instead of every time it is used
+import unicodedata # we import unicodedata to remove the accent of a letter e.g., 'š' → 's'
+from concurrent.futures import ThreadPoolExecutor # we import ThreadPoolExecutor to match several groups of players at the same time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # the folder above src/ i.e., project-repo
+sys.path.append(PROJECT_ROOT) # This allows us to import modules located in the project root like data_cache.py
+from data_cache import cached_read, cached_transform # reads a CSV file (and cleans it) but reuses a memory-mapped Arrow copy of the result on later runs
+
+LEAGUE_PATTERN = re.compile(r'(Liga|Premier|Serie|Bundesliga|Ligue)') # regex matching the keyword that identifies each league
+LEAGUE_NAMES = { # standard name of the league for each keyword
+    'Liga': 'La Liga',
+    'Premier': 'Premier League',
+    'Serie': 'Serie A',
+    'Bundesliga': 'Bundesliga',
+    'Ligue': 'Ligue 1'
+}
+LETTER_FOLDS = str.maketrans({'ø': 'o', 'ł': 'l', 'đ': 'd', 'æ': 'a', 'ß': 's'}) # letters that NFKD doesn't split into a letter and an accent, with the letter we use in their place
+SAVE_CSV = '--csv' in sys.argv # run "python src/match_transfers.py --csv" to also save the results as csv files next to the parquet files
 
 # ============================================
 print("="*60)
 print("MATCHING TRANSFERMARKT & FBREF DATA")
-print("TWO-PASS STRATEGY: BEFORE + AFTER")
+print("TWO-SEASON STRATEGY: BEFORE + AFTER")
 print("="*60)
 
 # We start off by loading and reding the filtered combined transfermarkt file
 print("\n Loading Transfermarkt data...")
-transfers = pd.read_csv('data/transfers_filtered.csv')
+transfers = cached_read('data/transfers_filtered.csv')
 print(f" Loaded {len(transfers)} transfers")
 
 # ============================================
 print("\n Loading CLEANED FBref data...")
 
-fbref = pd.read_csv("data/processed/fbref_cleaned.csv")
+def standardize_fbref(fbref):
+    """Add the standardized player name, season and league columns used for the matching"""
+    # Standardize player names (important for fuzzy matching)
+    fbref['player_clean'] = fbref['Player'].str.lower().str.strip()
 
-# Standardize player names (important for fuzzy matching)
-fbref['player_clean'] = fbref['Player'].str.lower().str.strip()
+    # Extract season start year (2022-2023 → 2022)
+    fbref['fbref_season'] = fbref['season'].str.slice(0, 4).astype(np.int16)
+    # Seasons are always written 'YYYY-YYYY' so we simply take the first 4 characters, which avoids building a list per value like split('-') did
+    # np.int16 is large enough for a year and takes 4 times less memory than the default 64-bit integers
 
-# Extract season start year (2022-2023 → 2022)
-fbref['fbref_season'] = fbref['season'].str.split('-').str[0].astype(int)
+    # Standardize league names to match Transfermarkt cleaning
+    fbref['fbref_league'] = fbref['league'].replace({
+        'Premier-League': 'Premier League',
+        'La-Liga': 'La Liga',
+        'Serie-A': 'Serie A',
+        'Bundesliga': 'Bundesliga',
+        'Ligue-1': 'Ligue 1'
+    })
 
-# Standardize league names to match Transfermarkt cleaning
-fbref['fbref_league'] = fbref['league'].replace({
-    'Premier-League': 'Premier League',
-    'La-Liga': 'La Liga',
-    'Serie-A': 'Serie A',
-    'Bundesliga': 'Bundesliga',
-    'Ligue-1': 'Ligue 1'
-})
+    return fbref[fbref['player_clean'].notna()] # We remove the rows where player_clean has a missing value i.e., NaN
+
+fbref = cached_transform("data/processed/fbref_cleaned.csv", standardize_fbref)
+# The first run parses the CSV and standardizes it, later runs memory-map the standardized Arrow copy in data/.cache/
+# The copy is rebuilt automatically whenever fbref_cleaned.csv or this script is modified
 
 print(f" Total FBref records: {len(fbref)}")
 
@@ -45,159 +74,182 @@ print("\n Preprocessing data...")
 
 # We now have to prepare the player's names for the fuzzy matching as we will match them between these 2 different combined files
 transfers['player_clean'] = transfers['Player'].str.lower().str.strip() # all these functions should make them as similar as possible to facilitate the matching process
-fbref['player_clean'] = fbref['Player'].str.lower().str.strip()
+# The fbref names were already standardized the same way in standardize_fbref()
 
 # Extract transfer year
-transfers['transfer_year'] = transfers['source_file'].str.extract(r'(\d{4})').astype(int) # The regex here allows use to extract the 4-digit year from the source_file column. 
+transfers['transfer_year'] = transfers['source_file'].str.slice(-8, -4).astype(np.int16) # This allows use to extract the 4-digit year from the source_file column. 
 # This is of particular importance because we want to be able to match the player for the correct season i.e., before and after the transfer
-# The source_file column contains the filename from which the transfer record came, which usually has the season or year in it. e.g., "premier_league_2022-2023.csv"
+# The source_file column contains the filename from which the transfer record came, which always ends with the year e.g., "premier_league_2022.csv"
+# So the year is always the 4 characters just before ".csv" i.e., from position -8 to -4, which we can slice directly instead of searching it with a regex
 # We want to store this as an integer because  we will subtract 1 to get the before season. 
+# We use np.int16 like for the fbref seasons so that both sides of the lookups below have the same type
 
 # Calculate before and after seasons
 transfers['season_before'] = transfers['transfer_year'] - 1
 transfers['season_after'] = transfers['transfer_year']
 
-# We define a standardize function in order to obtain the same homogeneous names for each league in order to avoid confusion
-def standardize_league(league):
-    league = str(league)
-    if 'Liga' in league or 'La-Liga' in league or 'La Liga' in league:
-        return 'La Liga'
-    elif 'Premier' in league:
-        return 'Premier League'
-    elif 'Serie' in league:
-        return 'Serie A'
-    elif 'Bundesliga' in league:
-        return 'Bundesliga'
-    elif 'Ligue' in league:
-        return 'Ligue 1'
-    return league
-
-transfers['league_clean'] = transfers['league'].apply(standardize_league) # this simply applies this newly created function to the values of 'league' in the combined transfer files as they weren't initially the same as in fbref
-#apply() takes a function and applies it to each value in the column
+# We want to obtain the same homogeneous names for each league in order to avoid confusion
+# LEAGUE_PATTERN finds the keyword identifying the league in each value e.g., 'Premier' in 'Premier League' and LEAGUE_NAMES gives the standard name for each keyword
+transfers['league_clean'] = transfers['league'].str.extract(LEAGUE_PATTERN, expand=False).map(LEAGUE_NAMES).fillna(transfers['league'])
+# str.extract() runs the compiled regex over the whole column at once instead of calling a Python function on each value like apply() did
+# map() then replaces each keyword by its standard name and fillna() keeps the original value if no keyword was found
+# this simply standardizes the values of 'league' in the combined transfer files as they weren't initially the same as in fbref
 
 print(" Preprocessing complete")
 
 # This allows us to remove rows player_clean has a missing value i.e., NaN
 transfers = transfers[transfers['player_clean'].notna()] # notna() returns false if there is a missing value and will hence be omitted from the updated combined file
-fbref = fbref[fbref['player_clean'].notna()] # same for fbref
 
 print(f" After cleaning: {len(transfers)} transfers, {len(fbref)} FBref records")
 
 # ============================================
-print("\n PASS 1: Matching BEFORE season stats...")
+print("\n Grouping FBref data by league and season...")
 
-def find_best_match(name, choices, threshold=78): # we define this function where name is the player you want to march from transfermarkt and choices is the list of names to match against from fbref
+def find_best_matches(names, choices, threshold=78): # we define this function where names are the players you want to match from transfermarkt and choices is the list of names to match against from fbref
     # threshold = 78 means that a match will occur only if it's 78% similar we reason as such because same names can be written differently e.g., C. Ronaldo and Cristiano Ronaldo
-    """Find best matching name using fuzzy string matching"""
-    # Handle missing/invalid names
-    if pd.isna(name) or not isinstance(name, str) or len(choices) == 0: # pd.isna returns true if the name is missing
-        return None, 0
-        # So here we return no matches if the name is missing or if name is not a string or if the list from fbref is empty meaning no list of names to match against from fbref
-    
-    # Filter out any NaN values from choices
-    valid_choices = [c for c in choices if pd.notna(c) and isinstance(c, str)] # This creates a cleaned list of choices to compare against. Only includes choices that are not misssing and are strings
-    
-    if len(valid_choices) == 0: # if the list of valid choices is empty we return no best matches obviously
-        return None, 0
-    
-    result = process.extractOne(name, valid_choices, scorer=fuzz.ratio) # This is a fuzzywuzzy function that allows us to find the closest match
-    # This function extractOne concretely compares name to each string in our list of valid_choices
-    # scorer = fuzz.ratio means that we use the Levenshtein distance ratio to measure similarity i.e., a scale from 0 to 100
-    # This returns a tuple  with the best match out of the valid_choices list and its respective similarity score
-    if result and result[1] >= threshold: # if we found a match and its similarity score exceeds the threshold of 78 then, we return the match
-        return result[0], result[1]
-    return None, 0 # otherwise we return None
-
-before_matches = {} # We will first be focusing on matching before season starts i.e., we want the stats of the player before the transfer occured in order to compare the before and after
-
-for idx, transfer in transfers.iterrows(): # .iterrows() is a method that allows you to loop over each row in the dataframe
-    player_name = transfer['player_clean']
-    dest_league = transfer['league_clean']
-    season_before = transfer['season_before']
-    # You extract the cleaned player name, destination league, and season before transfer
-    
-    # Now for the fbref data, you are making a boolean series in order to match the league and season of transfermarkt
-    # if the league of the fbref is the dest_league of transfermarkt df then return True. Same goes for season.
-    # This will make a new filtered dataframe as now pandas will only return the rows where both boolean are true i.e., where both match
-    fbref_filtered = fbref[
-        (fbref['fbref_league'] == dest_league) & 
-        (fbref['fbref_season'] == season_before)
-    ]
-    
-    if len(fbref_filtered) > 0: # if the newly filtered df is not empty
-        fbref_names = fbref_filtered['player_clean'].unique() # It extracts the player names from the filtered df and via unique() ensures that we only get each name once in order to avoid duplicates
-        # We now have a valid player name that we will try to match against
-        best_match, score = find_best_match(player_name, fbref_names) 
-        # we now use the previously created function with the player name from transfermarkt to match against the candidate fbref_names i.e., a list of player names that have been filtered to match the season and league of player's transfer season
-        
-        if best_match: # if there actually is a match based on previously defined criteria
-            fbref_stats = fbref_filtered[fbref_filtered['player_clean'] == best_match].iloc[0] # we select the row where the player’s cleaned name equals best_match. 
-            # .iloc[0] → selects the first row from the result (in case multiple rows match).
-            before_matches[idx] = fbref_stats.to_dict()
-            # This converts the fbref_stats Series into a dictionary using .to_dict().
-        # If best_match is None, it means no sufficiently similar name was found so we skip this player
-    
-    if (idx + 1) % 50 == 0:  # Prints a progress message every 50 rows
-        print(f"   Processed {idx + 1}/{len(transfers)} transfers...")
-
-print(f" BEFORE stats matched: {len(before_matches)}/{len(transfers)} ({len(before_matches)/len(transfers)*100:.1f}%)")
+    """Find the best matching name for each name using fuzzy string matching"""
+    scores = process.cdist(names, choices, scorer=fuzz.QRatio, processor=utils.default_process, score_cutoff=threshold - 0.5, dtype=np.uint8, workers=1) # This is a rapidfuzz function that compares every name to every choice in one single call
+    # cdist returns a NumPy matrix with one row per name and one column per choice containing their similarity score
+    # scorer = fuzz.QRatio means that we use the Levenshtein distance ratio to measure similarity i.e., a scale from 0 to 100 (like fuzz.ratio but an empty name scores 0 instead of 100)
+    # dtype = np.uint8 gives back each score rounded to an integer from 0 to 100 as fuzzywuzzy did, once score_cutoff has been applied, so the matrix is 4 times smaller than with the default float32 scores
+    # processor = utils.default_process lowercases the names and removes punctuation before comparing them, as fuzzywuzzy did by default
+    # score_cutoff sets every score below it to 0, but rapidfuzz compares it to the exact score i.e., before the rounding to an integer
+    # fuzzywuzzy rounded the score first and then compared it to 78, so e.g., a score of 77.78 was rounded to 78 and accepted
+    # This is why we use threshold - 0.5 i.e., 77.5: every score that rounds to 78 or more passes the cutoff, and the test on the rounded scores below does the rest
+    # workers=1 because the groups are already matched in parallel threads (see match_seasons), so each call uses a single core
+    best = scores.argmax(axis=1) # For each name, argmax gives us the position of the most similar choice (the first one in case of a tie, like extractOne)
+    found = scores.max(axis=1) >= threshold # True if the best rounded score of the row reaches the threshold, otherwise there is no match for this name
+    return [choices[b] if f else None for b, f in zip(best, found)] # We return the best matching choice for each name or None if no choice was similar enough
+
+fbref_names = fbref[['player_clean', 'fbref_league', 'fbref_season']].drop_duplicates()
+# The matching itself only needs the names, leagues and seasons of fbref so we work on these 3 columns only instead of carrying all the stats around
+# drop_duplicates() keeps each (name, league, season) once, in its order of appearance
+# The stats are only fetched from fbref_lookup (see below) once we know which fbref player a transfer is matched to
+
+fbref_blocks = {key: block['player_clean'] for key, block in fbref_names.groupby(['fbref_league', 'fbref_season'], sort=False)}
+# We split the fbref names once into one small Series per (league, season) e.g., ('Serie A', 2021)
+# This way we don't have to filter the whole fbref df again for every transfer, we simply look up the block we need in this dictionnary
+
+def name_initials(name):
+    """Return the first letter (without accent) of each word of a name e.g., 'benjamin šeško' → ['b', 's']"""
+    return [unicodedata.normalize('NFKD', word)[0].translate(LETTER_FOLDS) for word in utils.default_process(name).split()]
+    # default_process() lowercases the name and replaces punctuation by spaces e.g., "n'goumou" → "n goumou"
+    # NFKD splits an accented letter into the letter and its accent so [0] keeps only the letter
+    # Some letters like 'ø' have no accent to split off, translate() replaces them with LETTER_FOLDS e.g., 'ødegaard' → 'o'
+    # Otherwise 'martin ødegaard' would never be compared to 'martin odegaard' even though the fuzzy matching would accept them
+
+def blocking_key(name):
+    """Return the first letter of the surname i.e., the last word of the name"""
+    initials = name_initials(name)
+    return initials[-1] if initials else '' # '' if the name is empty after cleaning
+
+fbref_candidates = {}
+for key, block in fbref_blocks.items():
+    candidates = {} # For this (league, season), the fbref names grouped by the first letter of each of their words
+    for name in block: # the names of a block are already unique thanks to drop_duplicates()
+        for letter in set(name_initials(name)):
+            candidates.setdefault(letter, []).append(name)
+    fbref_candidates[key] = candidates
+# A transfermarkt name is only compared to the fbref names having a word starting with the same letter as its surname
+# e.g., 'cristiano ronaldo' is compared to names having a word in 'r' but no longer to 'cristian ansaldi'
+# We use every word of the fbref names and not only their last one because fbref sometimes adds a second surname e.g., 'óscar rodríguez arnaiz'
+# This divides the amount of names to compare against by roughly 10 and removes many wrong matches sharing only the first name e.g., 'callum robinson' and 'callum wilson'
+
+fbref_lookup = fbref.drop_duplicates(subset=['player_clean', 'fbref_league', 'fbref_season'], keep='first').set_index(['player_clean', 'fbref_league', 'fbref_season'], drop=False)
+# We only keep the first fbref row of each (name, league, season) in case multiple rows match
+# set_index() then builds a MultiIndex on these 3 columns once for the whole script, so that every lookup below is a hash lookup instead of a scan of the fbref df
+# drop=False keeps the 3 columns in the df as we also want them in the output files
+
+def lookup_stats(queries):
+    """Return the fbref row of each (player_clean, fbref_league, fbref_season) of queries that exists in fbref, indexed like queries"""
+    positions = fbref_lookup.index.get_indexer(pd.MultiIndex.from_frame(queries[['player_clean', 'fbref_league', 'fbref_season']]))
+    # get_indexer() gives us, for each query, the position of the identical key in fbref_lookup or -1 if there is none
+    found = positions >= 0
+    return fbref_lookup.iloc[positions[found]].set_axis(queries.index[found]) # We take the fbref rows that were found and give them the transfer index of their query
+
+def match_group(group):
+    """Fuzzy match one group of transfers having the same league, season and surname initial"""
+    (dest_league, season, letter), transfer_block = group
+    fbref_names = fbref_candidates.get((dest_league, season), {}).get(letter) # We get the fbref names of that same league and season having a word starting with that letter, None if there are none
+    if fbref_names is None:
+        return None
+
+    codes, unique_names = pd.factorize(transfer_block['player_clean'])
+    # The same player can appear several times in a group e.g., if the transfers data lists the same transfer twice
+    # factorize() gives us each distinct name once (unique_names) and, for each transfer, the position of its name in unique_names (codes)
+    best_matches = np.array(find_best_matches(list(unique_names), fbref_names), dtype=object)
+    # we now use the previously created function to match each distinct player name of this group against the candidate fbref_names at once
+    return pd.Series(best_matches[codes], index=transfer_block.index) # best_matches[codes] gives the match of each distinct name back to every transfer having that name
+
+def match_seasons(season_cols):
+    """Match every transfer to its fbref stats for each season column of season_cols, all in a single pass"""
+    queries = pd.concat({
+        season_col: transfers[['player_clean', 'league_clean', season_col]].rename(columns={'league_clean': 'fbref_league', season_col: 'fbref_season'})
+        for season_col in season_cols
+    })
+    # We rename the transfermarkt columns so that they have the same names as the fbref ones, e.g., season_before becomes fbref_season
+    # pd.concat() stacks the queries of all the seasons in one long df. The dictionary keys become the first level of the index
+    # e.g., ('season_before', 12) and ('season_after', 12) are the two queries of the transfer 12
+
+    # Step 1: exact matches
+    # Most transfermarkt names are written exactly like in fbref so we first look up each (name, league, season) directly in fbref_lookup
+    exact = lookup_stats(queries)
+
+    # Step 2: fuzzy matches
+    # Only the remaining queries i.e., those whose name is written differently in fbref go through the fuzzy matching
+    residual = queries[~queries.index.isin(exact.index)]
+    residual = residual.assign(blocking_key=residual['player_clean'].map(blocking_key)) # the first letter of the surname of each remaining transfer
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        fuzzy_names = [names for names in executor.map(match_group, residual.groupby(['fbref_league', 'fbref_season', 'blocking_key'], sort=False)) if names is not None]
+    # We loop over each group of queries having the same league, season and surname initial e.g., all transfers to Ligue 1 whose before or after season is 2019 and whose surname starts with 'm'
+    # As the before and after queries are grouped together, a before query and an after query for the same league and season are matched in the same cdist call
+    # executor.map() sends the groups to a pool of threads, one per CPU core. Rapidfuzz releases the GIL while it compares names so the threads really run at the same time
+    # This gives us a list with, for each group, the fbref name matched to each query (None if no match)
+
+    matched = [exact]
+    if fuzzy_names:
+        fuzzy_queries = residual[['fbref_league', 'fbref_season']].assign(player_clean=pd.concat(fuzzy_names)).dropna(subset=['player_clean'])
+        # We replace each transfermarkt name by the fbref name it was matched to and drop the players without a match
+        matched.append(lookup_stats(fuzzy_queries))
+        # The same lookup as for the exact matches now gives us the fbref row of each fuzzy match
+    matches = pd.concat(matched)
+
+    results = {}
+    for season_col in season_cols: # We now split the long df back into one df per season column
+        season_matches = matches[matches.index.get_level_values(0) == season_col].droplevel(0).sort_index()
+        # droplevel(0) removes the season column from the index so that we are left with the transfer index
+        # We sort by transfer index so that the matches keep the same order as the transfers df
+        n_exact = (exact.index.get_level_values(0) == season_col).sum()
+        print(f"   {season_col}: {n_exact} exact matches, {len(season_matches) - n_exact} fuzzy matches")
+        results[season_col] = season_matches # a df with one row of fbref stats per matched transfer, indexed by the transfer index
+    return results
+
+print(f" {len(fbref_blocks)} league/season blocks")
 
 # ============================================
-print("\n PASS 2: Matching AFTER season stats...")
-
-after_matches = {} # We now create a dictionnary for the after transfer stats as we want to see the shift in performance following the transfer.
-
-for idx, transfer in transfers.iterrows():
-    player_name = transfer['player_clean']
-    dest_league = transfer['league_clean']
-    season_after = transfer['season_after']
-    # Same process as before you extract the cleaned player name, destination league, but this time the season after the transfer
-    
-    # Same as before, this makes a new filtered dataframe as now pandas will only return the rows where both boolean are true i.e., where both match
-    fbref_filtered = fbref[
-        (fbref['fbref_league'] == dest_league) & 
-        (fbref['fbref_season'] == season_after)
-    ]
-    
-    if len(fbref_filtered) > 0:
-        fbref_names = fbref_filtered['player_clean'].unique()
-        best_match, score = find_best_match(player_name, fbref_names)
-        # # we now use the previously created function with the player name from transfermarkt to match against the candidate fbref_names i.e., a list of player names that have been filtered to match the season and league of player's transfer season
-        
-        if best_match:
-            fbref_stats = fbref_filtered[fbref_filtered['player_clean'] == best_match].iloc[0] # we select the row where the player’s cleaned name equals best_match. 
-            # .iloc[0] → selects the first row from the result (in case multiple rows match).
-            after_matches[idx] = fbref_stats.to_dict() # This converts the fbref_stats Series into a dictionary using .to_dict().
-        # If best_match is None, it means no sufficiently similar name was found so we skip this player
-    
-    if (idx + 1) % 50 == 0:
-        print(f"   Processed {idx + 1}/{len(transfers)} transfers...") # Prints a progress message every 50 rows
+print("\n Matching BEFORE and AFTER season stats...")
+
+season_matches = match_seasons(['season_before', 'season_after'])
+# We match both seasons at once: the before season as we want the stats of the player before the transfer occured in order to compare the before and after
+# and the after season as we want to see the shift in performance following the transfer
+before_matches = season_matches['season_before']
+after_matches = season_matches['season_after']
 
+print(f" BEFORE stats matched: {len(before_matches)}/{len(transfers)} ({len(before_matches)/len(transfers)*100:.1f}%)")
 print(f" AFTER stats matched: {len(after_matches)}/{len(transfers)} ({len(after_matches)/len(transfers)*100:.1f}%)")
 
 # ============================================
 print("\n Creating final datasets...")
 
+before_df = before_matches.add_prefix('before_') # We prefix each fbref column with before so we are able to separate the before and after transfer stats e.g., before_Gls, before_Ast ...
+after_df = after_matches.add_prefix('after_') # Here for after transfer stats e.g., after_Gls, after_Ast ...
+
 # Dataset 1: Players with BOTH before AND after stats (complete comparison)
-complete_matches = [] # This a list that will store dictionnaries containing Transfermarkt data for the player, FBref stats before the transfer and FBref stats after the transfer
-
-for idx in before_matches.keys(): # this loops over all indices that have a "before transfer" match
-    if idx in after_matches: # It checks if the same transfer also has a valid “after transfer” match in FBref if so:
-        transfer = transfers.loc[idx]  # Gives us the transfermarkt row corresponding to this index
-        # .loc[idx] selects the row by index label and returns a Pandas Series containing the player’s transfer data
-        before_stats = before_matches[idx] # Gets the before transfer fbref stats dictionnary for this player
-        after_stats = after_matches[idx] # Gets the after transfer fbref stats dictionnary for this player
-        
-        complete_record = { # If there is a before and after transfer match for the same player then, it creates a single dictionary combining all data for this player
-            **transfer.to_dict(), # converts the transfermarkt row corresponding to the index we are looping on into a dictionnary
-            **{f'before_{k}': v for k, v in before_stats.items()}, # We make a new dicitonnary where each key is prefixed with before so we are able to separate the before and after transfer stats
-            **{f'after_{k}': v for k, v in after_stats.items()} # Here for after transfer stats
-            # Given the fact that we are creating a dictionnary out of 3 diffrent ones, we use ** to able to merge all 3 of them into one single dictionnary
-        }
-        complete_matches.append(complete_record) # Now each player who had a before match and an after match now has a dictionnary with all his stats being transfer related as well as before and after season performance
-        # We now add each of these dictionnaries to the list
-
-print(f" Complete matches (BEFORE + AFTER): {len(complete_matches)}")
+complete_df = transfers.join(before_df, how='inner').join(after_df, how='inner')
+# join() places the dfs side by side by matching their index i.e., the transfer index
+# how='inner' keeps only the transfers present in both before_df and after_df, so 1 row per fully matched player with all his stats being transfer related as well as before and after season performance
+
+print(f" Complete matches (BEFORE + AFTER): {len(complete_df)}")
 
 # Dataset 2: All matches (with whatever data available)
 # We do this in order to increase the amount of matches because some players might have been in foreign leagues before their transfer hence the absence of before-transfer stats
@@ -207,57 +259,62 @@ print(f" Complete matches (BEFORE + AFTER): {len(complete_matches)}")
 # A player might have been transfered in january and consequently, their before season might be split into two teams
 # So there are several reasons why there weren't enough complete matches.
 
-all_matches = [] # So this list will contain one dictionary per transfer with whatever data available i.e., before stats if found and/or after stats if found
-for idx in transfers.index:  # We iterate over every index of the transfermarkt df i.e., every row of the transfers df
-    transfer = transfers.loc[idx]  # We select the row of the transfermarkt df at index idx
-    record = transfer.to_dict() # We convert this row into a dictionnary
-    record['has_before'] = idx in before_matches # We add a boolean key telling whether this player had before-season stats found. This will facilitate later filtering
-    record['has_after'] = idx in after_matches # Same for after-season stats
-    
-    if idx in before_matches: # If the player did in fact have before-transfer stats, we add them to the record
-        record.update({f'before_{k}': v for k, v in before_matches[idx].items()}) # update() merges the dictionary into record so now this new dictionary will have keys that look like before_Gls, before_Ast ...
-    if idx in after_matches: # Same principle for after-transfer stats
-        record.update({f'after_{k}': v for k, v in after_matches[idx].items()}) # Now this new dictionary will have keys that look like after_Gls, after_Ast ...
-    
-    all_matches.append(record) # We add each updated dictionnary to the list
+all_df = transfers.assign(
+    has_before=transfers.index.isin(before_matches.index), # We add a boolean column telling whether this player had before-season stats found. This will facilitate later filtering
+    has_after=transfers.index.isin(after_matches.index) # Same for after-season stats
+).join(before_df).join(after_df)
+# By default join() is a left join so we keep every transfer with whatever data available i.e., before stats if found and/or after stats if found, NaN otherwise
 
 # ============================================
 print("\n Final statistics:")
 print(f"   Total transfers: {len(transfers)}")
 print(f"   With BEFORE stats: {len(before_matches)} ({len(before_matches)/len(transfers)*100:.1f}%)")
 print(f"   With AFTER stats: {len(after_matches)} ({len(after_matches)/len(transfers)*100:.1f}%)")
-print(f"   With BOTH (complete): {len(complete_matches)} ({len(complete_matches)/len(transfers)*100:.1f}%)")
+print(f"   With BOTH (complete): {len(complete_df)} ({len(complete_df)/len(transfers)*100:.1f}%)")
 
 print("\n Complete matches by league:")
-complete_df = pd.DataFrame(complete_matches) # We make a df out of the list that contains both before and after-transfer season stats. So now, 1 row per fully matched player
 if len(complete_df) > 0: # if it's not empty
-    for league in complete_df['league_clean'].unique(): # Within this dictionary, we now loop over each league once
-        league_count = len(complete_df[complete_df['league_clean'] == league]) # This counts the number of complete matches for each league
-        league_total = len(transfers[transfers['league_clean'] == league]) # This counts the amount of total transfers in that league
-        print(f"   {league}: {league_count}/{league_total} ({league_count/league_total*100:.1f}%)") # Thanks to these 2 above, we now have something like Premier League: 60/120 (50.0%)
+    league_counts = complete_df.groupby('league_clean', sort=False).size() # This counts the number of complete matches for each league in a single pass over complete_df
+    # sort=False keeps the leagues in their order of appearance in complete_df
+    league_totals = transfers.groupby('league_clean').size() # This counts the amount of total transfers in each league
+    summary = pd.DataFrame({'matched': league_counts, 'total': league_totals.reindex(league_counts.index)})
+    summary['pct'] = summary['matched'] / summary['total'] * 100 # the percentage of complete matches for all leagues at once
+    for league, row in zip(summary.index, summary.itertuples(index=False)): # We now loop over the few rows of this summary only to print them
+        print(f"   {league}: {row.matched}/{row.total} ({row.pct:.1f}%)") # Thanks to these columns, we now have something like Premier League: 60/120 (50.0%)
 
 # ============================================
 print("\n Saving results...")
 
-# Save complete matches (BEFORE + AFTER)
-complete_df = pd.DataFrame(complete_matches) # We convert it again into a df because it was done only temporarily the last time
-complete_df.to_csv('data/processed/transfers_matched_complete.csv', index=False) # A csv extension only works on a df hence the importance of converting it into such
-# The file is now saved to the following path: 'data/processed/transfers_matched_complete.csv'
-print(f" Complete matches saved: data/processed/transfers_matched_complete.csv")
-
-# Same principle for the all_matches df
-all_df = pd.DataFrame(all_matches)
-all_df.to_csv('data/processed/transfers_matched_all.csv', index=False)
-print(f" All matches saved: data/processed/transfers_matched_all.csv")
-
-# We make an unmatched csv file containing all transfers who simultaneously lack before transfer season stats and after transfer season stats for whatever reason
-unmatched = transfers[~transfers.index.isin(before_matches.keys()) & ~transfers.index.isin(after_matches.keys())]
-# ~ means not therefore, you keep only transfers where the transfer index is not in before_matches and where transfer index is not in after_matches. These are fully unmatched transfers
+def save_dataset(df, name):
+    """Save df to data/processed/<name>.parquet, and to data/processed/<name>.csv as well if SAVE_CSV is True"""
+    path = f'data/processed/{name}.parquet'
+    df.to_parquet(path, engine='pyarrow', compression='zstd', index=False) # to_parquet() saves the df to a parquet file
+    # Parquet stores each column in binary form instead of writing every number as text like a csv file, so it is much faster to write and to read back
+    # compression='zstd' compresses the columns about as fast as snappy but the files end up smaller
+    if SAVE_CSV: # in case someone wants to open the results in a spreadsheet or another tool that can't read parquet files
+        df.to_csv(f'data/processed/{name}.csv', index=False)
+    return path
+
+# We make an unmatched dataset containing all transfers who simultaneously lack before transfer season stats and after transfer season stats for whatever reason
+unmatched = transfers[~(all_df['has_before'] | all_df['has_after']).to_numpy()]
+# has_before and has_after were already computed for all_df, which has exactly one row per transfer in the same order as transfers
+# | means or and ~ means not therefore, you keep only transfers that have neither before stats nor after stats. These are fully unmatched transfers
+# This way we reuse the two boolean columns instead of looking up the transfer index in before_matches and after_matches again
 # Rememeber transfers is already a df so we don't need to create a new one, we are just filtering the existing df. We are only keeping the rows with fully unmatched transfers
-unmatched.to_csv('data/processed/transfers_unmatched.csv', index=False)
-print(f" Unmatched transfers saved: data/processed/transfers_unmatched.csv")
+
+datasets = {
+    'Complete matches': (complete_df, 'transfers_matched_complete'), # complete matches (BEFORE + AFTER)
+    'All matches': (all_df, 'transfers_matched_all'), # Same principle for the all_df df
+    'Unmatched transfers': (unmatched, 'transfers_unmatched')
+}
+with ThreadPoolExecutor(max_workers=len(datasets)) as executor:
+    paths = list(executor.map(lambda dataset: save_dataset(*dataset), datasets.values()))
+# The three files don't depend on each other so we save them at the same time in three threads
+# pyarrow releases the GIL while it encodes and compresses the columns so the threads really run in parallel
+for label, path in zip(datasets, paths):
+    print(f" {label} saved: {path}") # e.g., the complete matches are now saved to the following path: 'data/processed/transfers_matched_complete.parquet'
 
 print("\n" + "="*60)
 print(" MATCHING COMPLETE!")
 print("="*60)
-print(f"\nYour analysis-ready dataset: {len(complete_matches)} players with complete BEFORE/AFTER comparison")
+print(f"\nYour analysis-ready dataset: {len(complete_df)} players with complete BEFORE/AFTER comparison")